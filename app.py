@@ -2,39 +2,298 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import plotly.express as px
+import io
 import os
+import re
 from datetime import datetime
+from functools import partial
 
 # ---------- Config ----------
 st.set_page_config(page_title="India Startup Intelligence", layout="wide", page_icon="📈")
 
 DATA_FILE = "india_startup_funding_2015_2025_REAL_CLEANED_v2.csv"
+PREVIEW_ROWS = 1_000
+TREEMAP_SECTORS = 30
+PREVIEW_ROW_CHOICES = [100, 500, 1_000, 2_500, 5_000]
+# every upload gets a new file id, so the per-file caches keep only the most recent few
+FILE_CACHE_ENTRIES = 4
 
 # ---------- Helpers ----------
-def load_dataframe(uploaded_file):
-    if uploaded_file is not None:
-        try:
-            return pd.read_csv(uploaded_file, encoding="utf-8", low_memory=False)
-        except:
-            return pd.read_csv(uploaded_file, encoding="latin1", low_memory=False)
-    if os.path.exists(DATA_FILE):
-        try:
-            return pd.read_csv(DATA_FILE, encoding="utf-8", low_memory=False)
-        except:
-            return pd.read_csv(DATA_FILE, encoding="latin1", low_memory=False)
-    return None
-
 def find_column(df, candidates):
     for c in candidates:
         if c in df.columns:
             return c
     return None
 
+COLUMN_CANDIDATES = {
+    "date": ["date"],
+    "startup": ["startup_name"],
+    "city": ["city"],
+    "industry": ["industry_vertical"],
+    "sector": ["sector"],
+    "amount": ["amount_in_usd"],
+    "investor": ["investors_name"],
+    "meity": ["is_meity_recognized"],
+}
+
+def resolve_columns(df):
+    return {k: find_column(df, v) for k, v in COLUMN_CANDIDATES.items()}
+
+AMOUNT_PATTERN = r'[$,₹\s]'
+
+def arrow_array(s):
+    # an Arrow-backed column can span several chunks (one per CSV block), and most kernels
+    # here need a single contiguous array, so always come back with one
+    return pa.chunked_array([pa.array(s, from_pandas=True)]).combine_chunks()
+
 def clean_amount_series(s):
-    s = s.astype(str).str.replace(r'[\$,₹,]', '', regex=True)
-    s = s.replace(['undisclosed','nan','none','None',''], np.nan)
-    return pd.to_numeric(s, errors='coerce')
+    # amounts repeat heavily, so dictionary-encode and run the Arrow regex + numeric parse
+    # over the distinct strings only, then gather back through the indices (-1 = missing);
+    # sentinels like "undisclosed" are left for to_numeric(errors='coerce') to turn into NaN
+    enc = pc.dictionary_encode(pc.cast(arrow_array(s), pa.large_string()))
+    uniq = pc.replace_substring_regex(enc.dictionary, AMOUNT_PATTERN, '')
+    vals = pd.to_numeric(pd.Series(uniq.to_numpy(zero_copy_only=False), dtype=object), errors='coerce')
+    codes = enc.indices.fill_null(-1).to_numpy()
+    return pd.Series(np.append(vals.to_numpy(dtype=float), np.nan)[codes], index=s.index)
+
+def category_mask(codes, categories, selected):
+    # lookup table over category codes; the extra trailing slot catches code -1 (missing)
+    lut = np.zeros(len(categories) + 1, dtype=bool)
+    lut[pd.Index(categories).get_indexer(selected)] = True
+    lut[-1] = False
+    return lut[codes]
+
+DATE_MATCH_RATE = 0.95
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d", "%d.%m.%Y")
+
+def parse_dates(s):
+    # probe the first value against known formats and parse the column with a match, keeping it
+    # only if it reads nearly every value (so an ambiguous or odd first value can't silently
+    # blank the rest); only fall back to per-row inference when nothing fits
+    present = s.dropna()
+    first = str(present.iloc[0]).strip() if len(present) else ""
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(first, fmt)
+        except ValueError:
+            continue
+        parsed = pd.to_datetime(s, format=fmt, errors="coerce", cache=True)
+        if parsed.count() >= DATE_MATCH_RATE * len(present):
+            return parsed
+    return pd.to_datetime(s, errors="coerce", cache=True)
+
+CSV_BLOCK_BYTES = 32 << 20
+
+def normalize_columns(columns):
+    return columns.str.strip().str.lower().str.replace(" ", "_")
+
+def clean_chunk(ch):
+    # dates are left as strings here: parse_dates picks one format for the whole file in
+    # read_csv_source, so blocks can't each settle on a different reading of the same dates
+    ch.columns = normalize_columns(ch.columns)
+    startup_col = find_column(ch, COLUMN_CANDIDATES["startup"])
+    amount_col = find_column(ch, COLUMN_CANDIDATES["amount"])
+    ch[amount_col] = clean_amount_series(ch[amount_col])
+    ch = ch.dropna(subset=[amount_col, startup_col])
+    # narrower dtypes halve the bytes every mask/sum pass moves; sums still accumulate in float64
+    ch[amount_col] = ch[amount_col].astype("float32")
+    return ch
+
+MEITY_LABELS = {
+    "yes": "Yes", "y": "Yes", "true": "Yes", "1": "Yes", "recognized": "Yes", "recognised": "Yes",
+    "no": "No", "n": "No", "false": "No", "0": "No", "not recognized": "No", "not recognised": "No"
+}
+
+def relabel_categories(s, names):
+    # names holds the new label per category; labels that now collide are merged and the row
+    # codes are remapped in one gather (trailing slot keeps code -1 missing)
+    remap, uniq = pd.factorize(names)
+    return pd.Categorical.from_codes(np.append(remap, -1)[s.cat.codes], uniq)
+
+def open_source(source):
+    # source is either raw upload bytes or a path on disk
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+def read_csv_source(source, encoding):
+    # Arrow's streaming reader parses block by block on several threads, and each block is
+    # cleaned before the next is read, so peak memory is one raw block plus the cleaned output.
+    # Every column is read as a string: amounts are parsed in clean_chunk and dates once over
+    # the joined column, fixed types avoid per-block inference mismatches, and the columns the
+    # dashboard doesn't use stay compact Arrow strings that are only touched by the download,
+    # which exports them verbatim
+    header = pd.read_csv(open_source(source), encoding=encoding, nrows=0).columns
+    reader = pacsv.open_csv(
+        open_source(source),
+        read_options=pacsv.ReadOptions(encoding=encoding, block_size=CSV_BLOCK_BYTES),
+        # free-text columns such as company profiles can hold quoted line breaks
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True,
+                                             column_types={c: pa.string() for c in header}),
+    )
+    df = pd.concat([clean_chunk(batch.to_pandas(types_mapper=pd.ArrowDtype)) for batch in reader],
+                   ignore_index=True)
+    date_col = find_column(df, COLUMN_CANDIDATES["date"])
+    df[date_col] = parse_dates(df[date_col])
+    df = df.dropna(subset=[date_col]).reset_index(drop=True)
+    df["year"] = df[date_col].dt.year.astype("int16")
+    return df
+
+def prepare_frame(source):
+    # parse, clean and encode the CSV; returns the ready-to-filter frame plus the resolved column names
+    try:
+        df = read_csv_source(source, "utf-8")
+    except:
+        df = read_csv_source(source, "latin1")
+    cols = resolve_columns(df)
+    # categories are set after concat so every chunk shares one set of codes;
+    # Arrow-backed strings regress on groupby, so the filter/group keys go to category
+    for key in ("industry", "sector", "city", "meity"):
+        if cols[key]:
+            df[cols[key]] = df[cols[key]].astype("category")
+    # names repeat once per row, so tidy the distinct names only: startups are stripped and
+    # the MeitY spellings fold onto "Yes"/"No" (anything unrecognised is just capitalised)
+    startups = df[cols["startup"]].astype("category")
+    df[cols["startup"]] = relabel_categories(startups, startups.cat.categories.astype(str).str.strip())
+    if cols["meity"]:
+        meity = df[cols["meity"]]
+        labels = meity.cat.categories.astype(str).str.strip()
+        mapped = labels.str.lower().map(MEITY_LABELS)
+        df[cols["meity"]] = relabel_categories(meity, mapped.where(mapped.notna(), labels.str.capitalize()))
+    return df, cols
+
+# bump whenever cleaning or the column set changes, so sidecars written by older code are ignored
+PREPARED_VERSION = 4
+
+def prepared_path(path):
+    return f"{os.path.splitext(path)[0]}.prepared.v{PREPARED_VERSION}.parquet"
+
+@st.cache_data(show_spinner="Loading dataset...", max_entries=FILE_CACHE_ENTRIES)
+def load_and_clean(_source, data_key):
+    # the source is not hashed (an upload would be hashed byte by byte on every rerun);
+    # data_key is the upload id or the data file mtime, so a new upload or an edit busts the cache.
+    # The data file's prepared frame is also kept as parquet beside it, so a cold start only
+    # re-parses the CSV when the CSV is newer
+    if not isinstance(_source, str):
+        return prepare_frame(_source)
+    sidecar = prepared_path(_source)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) > data_key:
+        try:
+            # keep the text columns Arrow-backed, as the CSV reader leaves them
+            df = pq.read_table(sidecar).to_pandas(types_mapper={pa.string(): pd.ArrowDtype(pa.string())}.get)
+            return df, resolve_columns(df)
+        except:
+            pass  # unreadable sidecar: rebuild it from the CSV below
+    df, cols = prepare_frame(_source)
+    # written under a temporary name and renamed into place, so a killed run or a second
+    # worker writing at the same time never leaves a partial file at the final path
+    tmp = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp, compression="zstd")
+        os.replace(tmp, sidecar)
+    except:
+        # read-only checkout: just skip the sidecar
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return df, cols
+
+
+@st.cache_data(show_spinner=False, max_entries=FILE_CACHE_ENTRIES)
+def column_arrays(_df, data_key, cat_cols, startup_col, amount_col, date_col):
+    # struct-of-arrays copy of the hot columns, categoricals as their codes and dates as
+    # months since epoch; masks and grouped sums index these directly instead of paying
+    # per-Series overhead. pandas already picks the smallest signed code dtype that fits the
+    # category count, so the codes are kept as-is (a fixed narrow cast would wrap around)
+    arrays = {"year": _df["year"].to_numpy(np.int16), "amount": _df[amount_col].to_numpy(np.float32),
+              "month": _df[date_col].to_numpy("datetime64[M]").astype(np.int32)}
+    for col in (*cat_cols, startup_col):
+        arrays[col] = _df[col].cat.codes.to_numpy()
+    return arrays
+
+@st.cache_data(show_spinner=False, max_entries=FILE_CACHE_ENTRIES)
+def investor_index(_df, data_key, investor_col):
+    # split the comma-separated investors once per file into a tidy (row position,
+    # investor code) table with Arrow's list kernels; reruns only select rows from it
+    arr = arrow_array(_df[investor_col]).cast(pa.string())
+    parts = pc.split_pattern(arr, ",")
+    names = pc.utf8_trim_whitespace(pc.list_flatten(parts))
+    keep = pc.not_equal(names, "")
+    rows = pc.list_parent_indices(parts).filter(keep)
+    encoded = names.filter(keep).dictionary_encode()
+    return (rows.to_numpy(), encoded.indices.to_numpy().astype(np.int32),
+            encoded.dictionary.to_numpy(zero_copy_only=False))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def filter_mask(_arrays, _cat_options, data_key, year_range, selections):
+    # _arrays and _cat_options are not hashed; data_key identifies the loaded file, so
+    # widgets that don't touch the filters (e.g. Top N) reuse the cached mask
+    mask = _arrays["year"] >= year_range[0]
+    mask &= _arrays["year"] <= year_range[1]
+    for col, sel in selections:
+        # an empty selection (the default) means no filter, as does selecting everything,
+        # so either way the pass is skipped entirely
+        if 0 < len(sel) < len(_cat_options[col]):
+            mask &= category_mask(_arrays[col], _cat_options[col], sel)
+    return mask
+
+def grouped_sum(codes, values, n_groups):
+    # per-group sums over dense integer codes in one linear pass
+    return np.bincount(codes, weights=values, minlength=n_groups)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def summarize(_arrays, _mask, _cat_options, keys, amount_col, filter_key):
+    # one grouped pass over the categorical codes shared by the pie, city, sector and
+    # insight panels; the underscored inputs are not hashed, filter_key identifies them.
+    # Missing values (code -1) get their own trailing slot per key so no row is dropped.
+    # The combined codes are compacted to the combinations that occur before counting, so
+    # the bincounts scale with the rows, not with the product of the category counts
+    dims = [len(_cat_options[k]) + 1 for k in keys]
+    codes = np.ravel_multi_index([_arrays[k][_mask] % d for k, d in zip(keys, dims)], dims)
+    groups, hit = pd.factorize(codes, sort=True)
+    sums = grouped_sum(groups, _arrays["amount"][_mask], len(hit))
+    deals = np.bincount(groups, minlength=len(hit))
+    out = pd.DataFrame({k: pd.Categorical.from_codes(np.where(c == d - 1, -1, c), categories=_cat_options[k])
+                        for k, d, c in zip(keys, dims, np.unravel_index(hit, dims))})
+    out[amount_col] = sums
+    out["deals"] = deals
+    return out
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def monthly_trend(_arrays, _mask, date_col, amount_col, filter_key):
+    # bincount over months since epoch; empty months in between come out as 0 like the
+    # pandas month-end Grouper did, and are labelled with the month-end date
+    months = _arrays["month"][_mask]
+    if not len(months):
+        return pd.DataFrame({date_col: pd.to_datetime([]), amount_col: []})
+    lo = months.min()
+    sums = grouped_sum(months - lo, _arrays["amount"][_mask], months.max() - lo + 1)
+    month_end = (np.arange(lo, lo + len(sums)).astype("datetime64[M]") + 1).astype("datetime64[D]") - 1
+    return pd.DataFrame({date_col: month_end.astype("datetime64[ns]"), amount_col: sums})
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def filtered_csv_bytes(_filtered, filter_key):
+    # Arrow's multi-threaded writer straight into bytes; timestamps that are all midnight are
+    # written as plain dates like the source file, any others at second precision
+    table = pa.Table.from_pandas(_filtered, preserve_index=False)
+    fields = []
+    for f, col in zip(table.schema, table.columns):
+        if pa.types.is_timestamp(f.type):
+            midnight = pc.all(pc.equal(pc.floor_temporal(col, unit="day"), col)).as_py() is not False
+            f = pa.field(f.name, pa.date32() if midnight else pa.timestamp("s"))
+        fields.append(f)
+    table = table.cast(pa.schema(fields), safe=False)
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def make_figure(kind, data, **kwargs):
+    # chart inputs are small aggregates, so hashing them is cheaper than rebuilding the figure
+    return getattr(px, kind)(data, **kwargs)
 
 CITY_COORDS = {
     "bengaluru": (12.9716, 77.5946),
@@ -53,154 +312,249 @@ CITY_COORDS = {
     "ghaziabad": (28.6692, 77.4538)
 }
 
-def geocode_city(city):
-    if pd.isna(city): return (np.nan, np.nan)
-    name = str(city).strip().lower()
-    for k,v in CITY_COORDS.items():
-        if k in name:
-            return v
-    return (np.nan, np.nan)
-
-def generate_insights(df, amount_col, city_col, sector_col, date_col, investor_col):
+# longest names first so the alternation prefers the most specific match at a position
+CITY_PATTERN = "(" + "|".join(map(re.escape, sorted(CITY_COORDS, key=len, reverse=True))) + ")"
+# coordinates as two contiguous float32 columns (ample precision for map points) with a
+# trailing NaN entry that unmatched names index
+CITY_NAMES = pd.Index(list(CITY_COORDS))
+CITY_LAT, CITY_LON = np.array(list(CITY_COORDS.values()) + [(np.nan, np.nan)], dtype=np.float32).T.copy()
+
+@st.cache_data(show_spinner=False, max_entries=FILE_CACHE_ENTRIES)
+def city_coords(_categories, data_key):
+    # geocode each distinct city once per file: exact name first, then the first known name it
+    # contains; returns (lat, lon) tables over category codes with a trailing NaN slot for code -1
+    names = pd.Series(_categories, dtype=str).str.strip().str.lower()
+    key = names.where(names.isin(CITY_COORDS.keys()), names.str.extract(CITY_PATTERN, expand=False))
+    # unmatched names index -1, the NaN row; the appended -1 is the slot for code -1
+    idx = np.append(CITY_NAMES.get_indexer(key), -1)
+    return CITY_LAT[idx], CITY_LON[idx]
+
+def top_n_rows(frame, col, n):
+    # argpartition picks the n largest in linear time; only those n are sorted
+    vals = frame[col].to_numpy()
+    idx = np.argpartition(vals, -n)[-n:] if len(vals) > n else np.arange(len(vals))
+    idx = idx[np.argsort(vals[idx], kind="stable")[::-1]]
+    return frame.iloc[idx].reset_index(drop=True)
+
+def fold_tail(totals, k):
+    # keep the k largest entries and fold the long tail into one "Other" entry, so the chart
+    # payload stays bounded however many categories the file has
+    if len(totals) <= k:
+        return totals
+    keep = np.zeros(len(totals), dtype=bool)
+    keep[np.argpartition(totals.to_numpy(), -k)[-k:]] = True
+    other = pd.Series([totals[~keep].sum()], index=["Other"])
+    return pd.concat([totals[keep], other]).rename_axis(totals.index.name)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def count_investors(_investors, _mask, top_n, filter_key):
+    # deals per investor for the rows in mask: one bincount over the pre-split table
+    rows, codes, names = _investors
+    deals = np.bincount(codes[_mask[rows]], minlength=len(names))
+    hit = np.flatnonzero(deals)
+    return top_n_rows(pd.DataFrame({"Investor": names[hit], "Deals": deals[hit]}), "Deals", top_n)
+
+def category_totals(s, weights):
+    # per-category totals over the codes in one bincount; like groupby(observed=True) only
+    # categories that occur are kept and missing codes are left out
+    codes = s.cat.codes.to_numpy()
+    keep = codes >= 0
+    n = len(s.cat.categories)
+    hit = np.flatnonzero(np.bincount(codes[keep], minlength=n))
+    sums = grouped_sum(codes[keep], weights.to_numpy()[keep], n)
+    return pd.Series(sums[hit].astype(weights.dtype), index=s.cat.categories[hit].rename(s.name))
+
+def generate_insights(summary, inv_summary, amount_col, city_col, sector_col):
+    # everything comes off tables the charts already computed; nothing rescans the rows
     insights = []
     try:
-        insights.append(f"Total funding: ${df[amount_col].sum():,.0f}")
-        insights.append(f"Top sector: {df.groupby(sector_col)[amount_col].sum().idxmax()}")
-        insights.append(f"Top city: {df[city_col].mode()[0]}")
-        invs = df[investor_col].str.split(',').explode().str.strip()
-        insights.append(f"Top investor: {invs.value_counts().idxmax()}")
+        insights.append(f"Total funding: ${summary[amount_col].sum():,.0f}")
+        insights.append(f"Top sector: {category_totals(summary[sector_col], summary[amount_col]).idxmax()}")
+        insights.append(f"Top city: {category_totals(summary[city_col], summary['deals']).idxmax()}")
+        insights.append(f"Top investor: {inv_summary.Investor[0]}")
     except:
         pass
     return insights
 
+# the Top N charts are fragments: moving their slider reruns just that chart instead of
+# the whole script (and re-sending the map)
+@st.fragment
+def top_cities_chart(summary, city_col, amount_col):
+    top_n = st.slider("Top N", 5, 25, 10, key="top_n_cities")
+    city_sum = top_n_rows(category_totals(summary[city_col], summary[amount_col]).reset_index(name=amount_col),
+                          amount_col, top_n)
+    fig_city = make_figure("bar", city_sum, x=amount_col, y=city_col, orientation="h")
+    st.plotly_chart(fig_city, width="stretch", key="city_bar")
+
+@st.fragment
+def top_investors_chart(investors, mask, filter_key):
+    top_n = st.slider("Top N", 5, 25, 10, key="top_n_investors")
+    inv_summary = count_investors(investors, mask, top_n, filter_key)
+    fig_inv = make_figure("bar", inv_summary, x="Deals", y="Investor", orientation="h")
+    st.plotly_chart(fig_inv, width="stretch", key="investor_bar")
+
+@st.fragment
+def data_preview(filtered, preview_cols):
+    # a fragment, so changing the row count re-sends only the table
+    n_rows = st.select_slider("Preview rows", PREVIEW_ROW_CHOICES, PREVIEW_ROWS)
+    st.dataframe(filtered[preview_cols].head(n_rows), hide_index=True)
+    if len(filtered) > n_rows:
+        st.caption(f"Showing the first {n_rows:,} of {len(filtered):,} rows.")
+
 # ---------- UI ----------
 st.title("🚀 India Startup Intelligence")
 
 uploaded = st.file_uploader("Upload merged CSV (optional)", type=["csv"])
-df = load_dataframe(uploaded)
-
-if df is None:
+if uploaded is not None:
+    data_key = uploaded.file_id
+    df, cols = load_and_clean(uploaded.getvalue(), data_key)
+elif os.path.exists(DATA_FILE):
+    data_key = os.path.getmtime(DATA_FILE)
+    df, cols = load_and_clean(DATA_FILE, data_key)
+else:
     st.stop()
 
-df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-
-date_col = find_column(df, ["date"])
-startup_col = find_column(df, ["startup_name"])
-city_col = find_column(df, ["city"])
-industry_col = find_column(df, ["industry_vertical"])
-sector_col = find_column(df, ["sector"])
-amount_col = find_column(df, ["amount_in_usd"])
-investor_col = find_column(df, ["investors_name"])
-meity_col = find_column(df, ["is_meity_recognized"])
-
-df[amount_col] = clean_amount_series(df[amount_col])
-df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-df = df.dropna(subset=[date_col, amount_col, startup_col])
-df["year"] = df[date_col].dt.year
+date_col = cols["date"]
+startup_col = cols["startup"]
+city_col = cols["city"]
+industry_col = cols["industry"]
+sector_col = cols["sector"]
+amount_col = cols["amount"]
+investor_col = cols["investor"]
+meity_col = cols["meity"]
 
 # ---------- Sidebar ----------
 st.sidebar.header("Controls")
 
-year_range = st.sidebar.slider(
-    "Year Range",
-    int(df.year.min()),
-    int(df.year.max()),
-    (int(df.year.min()), int(df.year.max()))
-)
-
-industry_sel = st.sidebar.multiselect("Industry", df[industry_col].unique(), default=df[industry_col].unique())
-sector_sel = st.sidebar.multiselect("Sector", df[sector_col].unique(), default=df[sector_col].unique())
-city_sel = st.sidebar.multiselect("City", df[city_col].unique(), default=df[city_col].unique())
-meity_sel = st.sidebar.multiselect("MeitY", df[meity_col].unique(), default=df[meity_col].unique())
-
-top_n = st.sidebar.slider("Top N", 5, 25, 10)
-
-filtered = df[
-    (df["year"].between(year_range[0], year_range[1])) &
-    (df[industry_col].isin(industry_sel)) &
-    (df[sector_col].isin(sector_sel)) &
-    (df[city_col].isin(city_sel)) &
-    (df[meity_col].isin(meity_sel))
-]
+FILTER_KEYS = ("year_filter", "industry_filter", "sector_filter", "city_filter", "meity_filter")
+# dropping the widget keys puts the filters back to their defaults on this same run;
+# cached data and the loaded frame are untouched
+if st.sidebar.button("Reset filters"):
+    for k in FILTER_KEYS:
+        st.session_state.pop(k, None)
+
+cat_cols = (industry_col, sector_col, city_col, meity_col)
+arrays = column_arrays(df, data_key, cat_cols, startup_col, amount_col, date_col)
+investors = investor_index(df, data_key, investor_col)
+
+# widget options only change with the data, so compute them once per loaded file
+if st.session_state.get("cat_options_key") != data_key:
+    st.session_state.cat_options_key = data_key
+    # selections from a previous file may not exist in this one
+    for k in FILTER_KEYS:
+        st.session_state.pop(k, None)
+    st.session_state.year_bounds = (int(arrays["year"].min()), int(arrays["year"].max()))
+    st.session_state.cat_options = {c: df[c].cat.categories.tolist() for c in cat_cols}
+year_lo, year_hi = st.session_state.year_bounds
+cat_options = st.session_state.cat_options
+
+year_range = st.sidebar.slider("Year Range", year_lo, year_hi, (year_lo, year_hi), key="year_filter")
+
+# nothing selected means all, so the widgets don't carry the full option lists as their value
+industry_sel = st.sidebar.multiselect("Industry", cat_options[industry_col], placeholder="All industries", key="industry_filter")
+sector_sel = st.sidebar.multiselect("Sector", cat_options[sector_col], placeholder="All sectors", key="sector_filter")
+city_sel = st.sidebar.multiselect("City", cat_options[city_col], placeholder="All cities", key="city_filter")
+meity_sel = st.sidebar.multiselect("MeitY", cat_options[meity_col], placeholder="All", key="meity_filter")
+
+selections = tuple((col, tuple(sorted(sel))) for col, sel in
+                   ((industry_col, industry_sel), (sector_col, sector_sel), (city_col, city_sel), (meity_col, meity_sel)))
+filter_key = (data_key, year_range, selections)
+mask = filter_mask(arrays, cat_options, *filter_key)
+# the full frame is only sliced for the panels that need row-level columns, and only when
+# the filters change; other reruns, such as a download click, reuse the slice
+if st.session_state.get("filtered_key") != filter_key:
+    st.session_state.filtered_key = filter_key
+    # with no effective filter the frame itself is used rather than a full-length copy
+    st.session_state.filtered = df if mask.all() else df[mask]
+filtered = st.session_state.filtered
+summary = summarize(arrays, mask, cat_options, [city_col, sector_col, meity_col], amount_col, filter_key)
 
 # ---------- KPIs ----------
 st.subheader("Key Metrics")
 k1, k2, k3, k4 = st.columns(4)
-k1.metric("Total Funding", f"${filtered[amount_col].sum():,.0f}")
-k2.metric("Startups", filtered[startup_col].nunique())
-k3.metric("Avg Round", f"${filtered[amount_col].mean():,.0f}")
-k4.metric("MeitY %", f"{(filtered[meity_col]=='Yes').mean()*100:.1f}%")
+# totals come off the cached summary; distinct startups are one bincount over the masked codes
+total = summary[amount_col].sum()
+deals = summary["deals"].sum()
+n_startups = np.count_nonzero(np.bincount(arrays[startup_col][mask]))
+k1.metric("Total Funding", f"${total:,.0f}")
+k2.metric("Startups", n_startups)
+k3.metric("Avg Round", f"${total / deals if deals else np.nan:,.0f}")
+# one MeitY count feeds both the KPI and the pie
+meity_counts = category_totals(summary[meity_col], summary["deals"])
+meity_total = meity_counts.sum()
+meity_pct = meity_counts.get("Yes", 0) / meity_total * 100 if meity_total else 0.0
+k4.metric("MeitY %", f"{meity_pct:.1f}%")
+
+st.subheader("Smart Insights Summary")
+inv_summary = count_investors(investors, mask, 1, filter_key)
+for i in generate_insights(summary, inv_summary, amount_col, city_col, sector_col):
+    st.write("•", i)
 
 # ================================
-# DASHBOARD VISUALIZATION GRID
+# DASHBOARD VISUALIZATION TABS
 # ================================
+# every tab body still runs on a rerun, but the cached helpers make the hidden ones cheap;
+# each chart has a stable key so the frontend keeps its component and only swaps the figure
+tab_meity, tab_cities, tab_sectors, tab_timeline, tab_investors = st.tabs(
+    ["MeitY", "Cities", "Sectors", "Timeline", "Investors"]
+)
 
-# ---------- ROW 1 ----------
-row1_col1, row1_col2 = st.columns(2)
-
-with row1_col1:
+with tab_meity:
     st.subheader("MeitY Recognition Distribution (Pie Chart)")
-    meity_df = filtered[meity_col].value_counts().reset_index()
-    meity_df.columns = ["Recognition", "Count"]
-    fig_meity = px.pie(meity_df, names="Recognition", values="Count", hole=0.4)
-    st.plotly_chart(fig_meity, use_container_width=True)
-
-with row1_col2:
-    st.subheader("Smart Insights Summary")
-    for i in generate_insights(filtered, amount_col, city_col, sector_col, date_col, investor_col):
-        st.write("•", i)
-
-# ---------- ROW 2 ----------
-row2_col1, row2_col2 = st.columns(2)
-
-with row2_col1:
-    st.subheader("Startup Distribution Across India (Map)")
-    temp = filtered.copy()
-    temp[["lat","lon"]] = temp[city_col].apply(lambda x: pd.Series(geocode_city(x)))
-    map_df = temp.dropna(subset=["lat","lon"])
-    fig_map = px.scatter_mapbox(
-        map_df, lat="lat", lon="lon",
-        hover_name=startup_col, size=amount_col, zoom=4
-    )
-    fig_map.update_layout(mapbox_style="open-street-map")
-    st.plotly_chart(fig_map, use_container_width=True)
-
-with row2_col2:
-    st.subheader("Top Cities by Total Funding (Bar Chart)")
-    city_sum = filtered.groupby(city_col)[amount_col].sum().reset_index()
-    fig_city = px.bar(city_sum, x=amount_col, y=city_col, orientation="h")
-    st.plotly_chart(fig_city, use_container_width=True)
-
-# ---------- ROW 3 ----------
-row3_col1, row3_col2 = st.columns(2)
-
-with row3_col1:
+    meity_df = meity_counts.rename_axis("Recognition").reset_index(name="Count")
+    fig_meity = make_figure("pie", meity_df, names="Recognition", values="Count", hole=0.4)
+    st.plotly_chart(fig_meity, width="stretch", key="meity_pie")
+
+with tab_cities:
+    map_col, city_bar_col = st.columns(2)
+
+    with map_col:
+        st.subheader("Startup Distribution Across India (Map)")
+        # rows are geocoded at city level, so per-row points would only stack on the same
+        # spot; one bubble per city keeps the map at a handful of points however many rows match
+        city_totals = pd.DataFrame({amount_col: category_totals(summary[city_col], summary[amount_col]),
+                                    "Deals": category_totals(summary[city_col], summary["deals"])})
+        lat_table, lon_table = city_coords(cat_options[city_col], data_key)
+        city_codes = pd.Index(cat_options[city_col]).get_indexer(city_totals.index)
+        map_df = city_totals.assign(lat=lat_table[city_codes], lon=lon_table[city_codes]).dropna(subset=["lat","lon"])
+        fig_map = make_figure(
+            "scatter_mapbox", map_df.reset_index(), lat="lat", lon="lon", hover_name=city_col,
+            hover_data=["Deals"], size=amount_col, zoom=4, mapbox_style="open-street-map"
+        )
+        st.plotly_chart(fig_map, width="stretch", key="city_map")
+
+    with city_bar_col:
+        st.subheader("Top Cities by Total Funding (Bar Chart)")
+        top_cities_chart(summary, city_col, amount_col)
+
+with tab_sectors:
     st.subheader("Sector-wise Funding Contribution (Treemap)")
-    sec_df = filtered.groupby(sector_col)[amount_col].sum().reset_index()
-    fig_sec = px.treemap(sec_df, path=[sector_col], values=amount_col)
-    st.plotly_chart(fig_sec, use_container_width=True)
+    sec_totals = fold_tail(category_totals(summary[sector_col], summary[amount_col]), TREEMAP_SECTORS)
+    sec_df = sec_totals.reset_index(name=amount_col)
+    fig_sec = make_figure("treemap", sec_df, path=[sector_col], values=amount_col)
+    st.plotly_chart(fig_sec, width="stretch", key="sector_treemap")
 
-with row3_col2:
+with tab_timeline:
     st.subheader("Monthly Funding Trend (Line Chart)")
-    trend = filtered.groupby(pd.Grouper(key=date_col, freq="M"))[amount_col].sum().reset_index()
-    fig_trend = px.line(trend, x=date_col, y=amount_col)
-    st.plotly_chart(fig_trend, use_container_width=True)
+    trend = monthly_trend(arrays, mask, date_col, amount_col, filter_key)
+    fig_trend = make_figure("line", trend, x=date_col, y=amount_col)
+    st.plotly_chart(fig_trend, width="stretch", key="funding_trend")
 
-# ---------- ROW 4 ----------
-st.markdown("---")
-st.subheader("Top Investors by Number of Deals (Bar Chart)")
-invs = filtered[investor_col].astype(str).str.split(",").explode()
-inv_summary = invs.value_counts().head(top_n).reset_index()
-inv_summary.columns = ["Investor", "Deals"]
-fig_inv = px.bar(inv_summary, x="Deals", y="Investor", orientation="h")
-st.plotly_chart(fig_inv, use_container_width=True)
+with tab_investors:
+    st.subheader("Top Investors by Number of Deals (Bar Chart)")
+    top_investors_chart(investors, mask, filter_key)
 
 # ---------- Data ----------
 st.markdown("---")
 st.subheader("Filtered Dataset Preview")
-st.dataframe(filtered)
-
-csv = filtered.to_csv(index=False).encode("utf-8")
-st.download_button("Download Filtered CSV", csv, "filtered_startups.csv")
+# only the resolved columns and the first rows go to the browser; the download has everything
+preview_cols = [c for c in dict.fromkeys((date_col, startup_col, city_col, industry_col, sector_col,
+                                         amount_col, investor_col, meity_col)) if c]
+data_preview(filtered, preview_cols)
+
+# the bytes are only built when the button is clicked (cached per filter signature), and the
+# click doesn't rerun the script
+st.download_button("Download Filtered CSV", partial(filtered_csv_bytes, filtered, filter_key),
+                   "filtered_startups.csv", mime="text/csv", on_click="ignore")
 
 st.markdown("<div style='text-align:center;color:gray'>Dashboard ready.</div>", unsafe_allow_html=True)